@@ -2,18 +2,19 @@ from __future__ import annotations
 
 import os
 import re
+from collections.abc import Iterator
 from pathlib import Path
 
 PERMISSION_VALUES = ("read-only", "safe-edit", "yolo")
 DEFAULT_PERMISSION = "safe-edit"
 
 _AGENT_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9._-]*$")
+_FRONTMATTER_PATTERN = re.compile(r"^---\s*\n(.*?)\n---\s*\n(.*)$", re.DOTALL)
 
 
 def parse_frontmatter(content: str) -> tuple[dict, str]:
     """Parse flat YAML frontmatter and return its fields and body."""
-    pattern = r"^---\s*\n(.*?)\n---\s*\n(.*)$"
-    match = re.match(pattern, content, re.DOTALL)
+    match = _FRONTMATTER_PATTERN.match(content)
 
     if not match:
         return {}, content
@@ -22,11 +23,13 @@ def parse_frontmatter(content: str) -> tuple[dict, str]:
     body = match.group(2)
 
     frontmatter = {}
-    for line in frontmatter_raw.split("\n"):
-        line = line.strip()
-        if ":" in line and not line.startswith("#"):
-            key, value = line.split(":", 1)
-            frontmatter[key.strip()] = value.strip().strip("\"'")
+    for line in frontmatter_raw.splitlines():
+        line = line.lstrip()
+        if not line or line[0] == "#":
+            continue
+        key, sep, value = line.partition(":")
+        if sep:
+            frontmatter[key.rstrip()] = value.strip().strip("\"'")
 
     return frontmatter, body
 
@@ -68,21 +71,23 @@ def load_agent(
 
     for ext in [".md", ".txt"]:
         agent_file = agents_path / f"{agent_name}{ext}"
+        # Only resolve the candidate that exists; a miss costs one stat().
+        if not agent_file.exists():
+            continue
         # Keep symlink targets within the agents directory.
         resolved = agent_file.resolve()
         if not resolved.is_relative_to(agents_root):
             raise ValueError(
                 f"Agent definition {agent_name!r} resolves outside the agents directory."
             )
-        if resolved.exists():
-            content = resolved.read_text(encoding="utf-8")
-            frontmatter, body = parse_frontmatter(content)
-            run_agent = frontmatter.get("run-agent")
-            permission = validate_permission(frontmatter.get("permission"))
-            model = frontmatter.get("model") or None
-            effort = frontmatter.get("effort") or None
-            description = extract_description(body)
-            return run_agent, body.strip(), description, str(resolved), permission, model, effort
+        content = resolved.read_text(encoding="utf-8")
+        frontmatter, body = parse_frontmatter(content)
+        run_agent = frontmatter.get("run-agent")
+        permission = validate_permission(frontmatter.get("permission"))
+        model = frontmatter.get("model") or None
+        effort = frontmatter.get("effort") or None
+        description = extract_description(body)
+        return run_agent, body.strip(), description, str(resolved), permission, model, effort
 
     raise FileNotFoundError(
         f"Agent definition {agent_name!r} was not found in {str(agents_root)!r}. "
@@ -90,32 +95,42 @@ def load_agent(
     )
 
 
-def list_agents(agents_dir: str) -> list[dict]:
-    """List agent names and descriptions, preferring Markdown definitions."""
-    agents_path = Path(agents_dir)
-    agents = []
-    seen_names: set[str] = set()
+def _describe_agent(name: str, path: str) -> dict:
+    try:
+        content = Path(path).read_text(encoding="utf-8")
+        _, body = parse_frontmatter(content)
+        return {"name": name, "description": extract_description(body)}
+    except (OSError, UnicodeDecodeError):
+        # Preserve discoverability when description extraction fails.
+        return {"name": name, "description": ""}
 
-    if not agents_path.exists():
-        return agents
 
-    for ext in [".md", ".txt"]:
-        for agent_file in agents_path.glob(f"*{ext}"):
-            name = agent_file.stem
-            if name in seen_names:
-                continue
-            seen_names.add(name)
-
-            try:
-                content = agent_file.read_text(encoding="utf-8")
-                _, body = parse_frontmatter(content)
-                description = extract_description(body)
-                agents.append({"name": name, "description": description})
-            except (OSError, UnicodeDecodeError):
-                # Preserve discoverability when description extraction fails.
-                agents.append({"name": name, "description": ""})
-
-    return sorted(agents, key=lambda a: a["name"])
+def iter_agents(agents_dir: str) -> Iterator[dict]:
+    """Yield agent names and descriptions in name order, preferring Markdown definitions."""
+    try:
+        with os.scandir(agents_dir) as it:
+            # Markdown sorts first so it wins when both extensions exist.
+            entries = sorted(it, key=lambda e: (os.path.normcase(e.name).endswith(".txt"), e.name))
+    except OSError:
+        return
+
+    paths_by_name: dict[str, str] = {}
+    for entry in entries:
+        name, _, ext = entry.name.rpartition(".")
+        if os.path.normcase(ext) not in ("md", "txt") or not name or name in paths_by_name:
+            continue
+        if not entry.is_file():
+            continue
+        paths_by_name[name] = entry.path
+
+    names = sorted(paths_by_name)
+    paths = [paths_by_name[name] for name in names]
+    yield from map(_describe_agent, names, paths)
+
+
+def list_agents(agents_dir: str) -> list[dict]:
+    """List agent names and descriptions, preferring Markdown definitions."""
+    return list(iter_agents(agents_dir))
 
 
 def get_agents_dir(args_agents_dir: str | None, args_cwd: str | None) -> str:
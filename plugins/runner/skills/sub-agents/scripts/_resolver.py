@@ -1,12 +1,36 @@
 from __future__ import annotations
 
+import functools
 import os
 
 from _constants import SUPPORTED_CLIS
 
+# Markers searched for in the parent's executable path or command line, in order.
+_CALLER_MARKERS = (
+    ("claude", "claude"),
+    ("cursor", "cursor-agent"),
+    ("codex", "codex"),
+    ("gemini", "gemini"),
+    ("grok", "grok"),
+    ("opencode", "opencode"),
+)
 
+
+def _match_caller(text: str) -> str | None:
+    text = text.lower()
+    for marker, cli in _CALLER_MARKERS:
+        if marker in text:
+            return cli
+    return None
+
+
+@functools.lru_cache(maxsize=1)
 def detect_caller_cli() -> str | None:
-    """Detect the caller from environment variables or Linux ``/proc``."""
+    """Detect the caller from environment variables or Linux ``/proc``.
+
+    The parent process and its environment do not change while we run, so
+    the answer is computed once per process.
+    """
     if os.environ.get("CLAUDE_CODE"):
         return "claude"
     if os.environ.get("CURSOR_AGENT"):
@@ -18,24 +42,23 @@ def detect_caller_cli() -> str | None:
     if os.environ.get("GROK_CLI"):
         return "grok"
 
+    ppid = os.getppid()
+    try:
+        # A single readlink(2) identifies natively built CLIs.
+        detected = _match_caller(os.readlink(f"/proc/{ppid}/exe"))
+        if detected:
+            return detected
+    except OSError:
+        # Caller detection is optional.
+        pass
+
     try:
-        ppid = os.getppid()
+        # Script-based CLIs run under an interpreter such as node; their
+        # name only appears in the command line.
         cmdline_path = f"/proc/{ppid}/cmdline"
         if os.path.exists(cmdline_path):
             with open(cmdline_path, encoding="utf-8", errors="replace") as f:
-                cmdline = f.read().lower()
-                if "claude" in cmdline:
-                    return "claude"
-                if "cursor" in cmdline:
-                    return "cursor-agent"
-                if "codex" in cmdline:
-                    return "codex"
-                if "gemini" in cmdline:
-                    return "gemini"
-                if "grok" in cmdline:
-                    return "grok"
-                if "opencode" in cmdline:
-                    return "opencode"
+                return _match_caller(f.read())
     except (FileNotFoundError, PermissionError, OSError):
         # Caller detection is optional.
         pass
@@ -13,7 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from _builder import AgentInvocation  # noqa: E402
 from _constants import DEFAULT_TIMEOUT_MS, SUPPORTED_CLIS_HELP  # noqa: E402
 from _executor import execute_agent  # noqa: E402
-from _loader import get_agents_dir, list_agents, load_agent  # noqa: E402
+from _loader import get_agents_dir, iter_agents, load_agent  # noqa: E402
 from _resolver import resolve_cli  # noqa: E402
 
 
@@ -24,6 +24,17 @@ def _print_error(error: str, exit_code: int = 1, cli: str | None = None) -> None
     print(json.dumps(payload))
 
 
+def _print_agent_list(agents_dir: str) -> None:
+    """Write the --list payload one agent at a time instead of building it whole."""
+    write = sys.stdout.write
+    write('{"agents": [')
+    for index, agent in enumerate(iter_agents(agents_dir)):
+        if index:
+            write(", ")
+        write(json.dumps(agent, ensure_ascii=False))
+    write('], "agents_dir": ' + json.dumps(agents_dir, ensure_ascii=False) + "}\n")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Execute external CLI AIs as sub-agents")
     parser.add_argument("--list", action="store_true", help="List available agents")
@@ -42,9 +53,7 @@ def main() -> None:
     args = parser.parse_args()
 
     if args.list:
-        agents_dir = get_agents_dir(args.agents_dir, args.cwd)
-        agents = list_agents(agents_dir)
-        print(json.dumps({"agents": agents, "agents_dir": agents_dir}, ensure_ascii=False))
+        _print_agent_list(get_agents_dir(args.agents_dir, args.cwd))
         sys.exit(0)
 
     if not args.agent:
@@ -42,7 +42,7 @@ def build_final_response(
     cli: str,
     returncode: int | None,
     result: dict | None,
-    stdout_lines: list,
+    stdout_text: str,
     stderr: str,
     terminated_by_us: bool = False,
 ) -> dict:
@@ -59,7 +59,7 @@ def build_final_response(
         status = "error"
 
     response = {
-        "result": result.get("result", "") if result else "".join(stdout_lines),
+        "result": result.get("result", "") if result else stdout_text,
         "exit_code": exit_code,
         "status": status,
         "cli": cli,
@@ -76,7 +76,16 @@ _LINE = "line"
 _EOF = "eof"
 
 # Bound captured output to prevent an unending stream from exhausting memory.
-_MAX_STDOUT_CHARS = 64 * 1024 * 1024
+_MAX_STDOUT_BYTES = 64 * 1024 * 1024
+# One pipe read per chunk instead of one Python-level call per line.
+_READ_CHUNK_BYTES = 64 * 1024
+# Most CLIs exit promptly after their final event; SIGTERM only stragglers.
+_RESULT_EXIT_GRACE_SEC = 1.0
+
+
+def _decode(data: bytes) -> str:
+    # CLI streams are UTF-8 regardless of host locale.
+    return data.decode("utf-8", "replace")
 
 
 def _spawn_reader(process: subprocess.Popen) -> queue.Queue:
@@ -84,9 +93,25 @@ def _spawn_reader(process: subprocess.Popen) -> queue.Queue:
     line_q: queue.Queue = queue.Queue()
 
     def reader() -> None:
+        buf = bytearray()
         try:
-            for line in iter(process.stdout.readline, ""):
-                line_q.put((_LINE, line))
+            while True:
+                chunk = process.stdout.read1(_READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                buf += chunk
+                start = 0
+                # Earlier bytes were already scanned, so long lines split in linear time.
+                end = buf.find(b"\n", len(buf) - len(chunk))
+                # The view must be released before buf is resized.
+                with memoryview(buf) as view:
+                    while end != -1:
+                        line_q.put((_LINE, bytes(view[start : end + 1])))
+                        start = end + 1
+                        end = buf.find(b"\n", start)
+                del buf[:start]
+            if buf:
+                line_q.put((_LINE, bytes(buf)))
         finally:
             line_q.put((_EOF, None))
 
@@ -114,11 +139,21 @@ def _drain_to_eof(line_q: queue.Queue, budget_sec: float = 0.5) -> None:
             return
 
 
+def _finish_after_result(process: subprocess.Popen, deadline: float) -> None:
+    """Give a CLI that has emitted its result a moment to exit before terminating it."""
+    grace = min(_RESULT_EXIT_GRACE_SEC, max(0.0, deadline - time.monotonic()))
+    try:
+        process.wait(timeout=grace)
+    except subprocess.TimeoutExpired:
+        process.terminate()
+
+
 def _drive_process(process: subprocess.Popen, cli: str, timeout_ms: int) -> dict:
     deadline = time.monotonic() + timeout_ms / 1000
     processor = StreamProcessor()
-    stdout_lines: list = []
-    accumulated_chars = 0
+    # Raw bytes; decoded once, and only if no result is parsed.
+    stdout_chunks: list = []
+    accumulated_bytes = 0
     line_q = _spawn_reader(process)
     saw_terminal = False
 
@@ -141,22 +176,26 @@ def _drive_process(process: subprocess.Popen, cli: str, timeout_ms: int) -> dict
 
             if kind == _EOF:
                 break
-            stdout_lines.append(line)
-            accumulated_chars += len(line)
-            if not saw_terminal and accumulated_chars > _MAX_STDOUT_CHARS:
+            if saw_terminal:
+                # Raw stdout is only a fallback for runs that never produce a result.
+                continue
+            stdout_chunks.append(line)
+            accumulated_bytes += len(line)
+            if accumulated_bytes > _MAX_STDOUT_BYTES:
                 process.kill()
                 _drain_to_eof(line_q)
                 process.communicate()
                 return _error_response(
                     cli,
                     1,
-                    f"Sub-agent output exceeded {_MAX_STDOUT_CHARS} characters. "
+                    f"Sub-agent output exceeded {_MAX_STDOUT_BYTES} bytes. "
                     "Retry with a narrower task.",
                     partial_result=processor.get_result(),
                 )
-            if not saw_terminal and processor.process_line(line):
-                process.terminate()
+            if processor.process_line(line):
                 saw_terminal = True
+                stdout_chunks.clear()
+                _finish_after_result(process, deadline)
 
         # Allow a short graceful-exit window before killing the process.
         wait_remaining = max(0.1, deadline - time.monotonic())
@@ -167,17 +206,18 @@ def _drive_process(process: subprocess.Popen, cli: str, timeout_ms: int) -> dict
             _, stderr = process.communicate()
             return _timeout_payload(cli, processor, timeout_ms)
 
+        stdout_text = _decode(b"".join(stdout_chunks))
         result = processor.get_result()
         if result is None:
-            processor.process_complete_output("".join(stdout_lines))
+            processor.process_complete_output(stdout_text)
             result = processor.get_result()
 
         return build_final_response(
             cli,
             process.returncode,
             result,
-            stdout_lines,
-            stderr,
+            stdout_text,
+            _decode(stderr or b""),
             terminated_by_us=saw_terminal,
         )
     except (OSError, ValueError) as e:
@@ -218,11 +258,7 @@ def _spawn_and_drive(
             stdin=subprocess.DEVNULL,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            # CLI streams are UTF-8 regardless of host locale.
-            encoding="utf-8",
-            errors="replace",
-            bufsize=1,
+            bufsize=_READ_CHUNK_BYTES,
             env=proc_env,
         )
     except FileNotFoundError:
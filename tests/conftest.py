@@ -1,10 +1,22 @@
-"""Shared test setup: ensure the sub-agents script directory is on sys.path."""
+"""Shared test setup: sys.path for the sub-agents scripts and per-test state resets."""
 
 from __future__ import annotations
 
 import sys
 from pathlib import Path
 
+import pytest
+
 SCRIPTS_DIR = Path(__file__).parent.parent / "skills" / "sub-agents" / "scripts"
 if str(SCRIPTS_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPTS_DIR))
+
+from _resolver import detect_caller_cli  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _reset_caller_detection():
+    # Tests patch the environment per case; don't let one case's answer stick.
+    detect_caller_cli.cache_clear()
+    yield
+    detect_caller_cli.cache_clear()
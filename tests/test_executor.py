@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import os
+import subprocess
 import sys
 import tempfile
 import threading
@@ -14,7 +15,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 from _builder import AgentInvocation
-from _executor import _build_proc_env, build_final_response, execute_agent
+from _executor import _READ_CHUNK_BYTES, _build_proc_env, build_final_response, execute_agent
 from run_subagent import main
 
 
@@ -42,28 +43,28 @@ class TestBuildFinalResponse:
     """Status determination from (returncode, parsed result, stdout, stderr)."""
 
     def test_success(self):
-        r = build_final_response("codex", 0, {"result": "ok"}, [], "")
+        r = build_final_response("codex", 0, {"result": "ok"}, "", "")
         assert r == {"result": "ok", "exit_code": 0, "status": "success", "cli": "codex"}
 
     def test_sigterm_with_result_is_success(self):
         # CLI was terminated after the result event — that's still success
-        r = build_final_response("claude", 143, {"result": "ok"}, [], "")
+        r = build_final_response("claude", 143, {"result": "ok"}, "", "")
         assert r["status"] == "success"
         assert r["exit_code"] == 143
 
     def test_returncode_none_treated_as_failure(self):
         # Defensive: process not yet finished should not be reported as success
-        r = build_final_response("codex", None, {"result": "ok"}, [], "")
+        r = build_final_response("codex", None, {"result": "ok"}, "", "")
         assert r["exit_code"] == 1
         assert r["status"] == "partial"
 
     def test_nonzero_with_result_is_partial(self):
-        r = build_final_response("codex", 2, {"result": "stuff"}, [], "")
+        r = build_final_response("codex", 2, {"result": "stuff"}, "", "")
         assert r["status"] == "partial"
         assert r["exit_code"] == 2
 
     def test_result_marked_partial_stays_partial_even_with_zero_exit(self):
-        r = build_final_response("grok", 0, {"result": "progress", "status": "partial"}, [], "")
+        r = build_final_response("grok", 0, {"result": "progress", "status": "partial"}, "", "")
         assert r["status"] == "partial"
         assert r["exit_code"] == 0
 
@@ -72,7 +73,7 @@ class TestBuildFinalResponse:
             "grok",
             1,
             {"result": "progress", "status": "partial"},
-            [],
+            "",
             "",
             terminated_by_us=True,
         )
@@ -83,27 +84,27 @@ class TestBuildFinalResponse:
         # Windows: terminate() maps to TerminateProcess and yields exit code 1,
         # unlike POSIX SIGTERM (143 / -15). When we asked the CLI to stop after a
         # complete result, the exit code is irrelevant — it must report success.
-        r = build_final_response("claude", 1, {"result": "ok"}, [], "", terminated_by_us=True)
+        r = build_final_response("claude", 1, {"result": "ok"}, "", "", terminated_by_us=True)
         assert r["status"] == "success"
         assert r["exit_code"] == 1
 
     def test_nonzero_with_result_not_terminated_is_partial(self):
         # Same exit code 1, but we did NOT initiate termination — a genuine
         # abnormal exit with partial output stays "partial", not "success".
-        r = build_final_response("claude", 1, {"result": "ok"}, [], "", terminated_by_us=False)
+        r = build_final_response("claude", 1, {"result": "ok"}, "", "", terminated_by_us=False)
         assert r["status"] == "partial"
         assert r["exit_code"] == 1
 
     def test_returncode_none_without_result_is_error(self):
         # No exit and no parsed payload — must not slip through as success.
-        r = build_final_response("codex", None, None, [], "")
+        r = build_final_response("codex", None, None, "", "")
         assert r["status"] == "error"
         assert r["exit_code"] == 1
         # No stderr means just the bare "exited with code" message, no colon suffix.
         assert r["error"] == "CLI exited with code 1"
 
     def test_nonzero_without_result_is_error_with_stderr(self):
-        r = build_final_response("codex", 1, None, ["raw line\n"], "boom")
+        r = build_final_response("codex", 1, None, "raw line\n", "boom")
         assert r["status"] == "error"
         assert r["exit_code"] == 1
         assert r["error"] == "CLI exited with code 1: boom"
@@ -133,8 +134,8 @@ class TestExecuteAgent:
 
     def test_codex_concatenates_prompt_with_agent_file(self):
         mock_process = MagicMock()
-        mock_process.stdout.readline.return_value = ""
-        mock_process.communicate.return_value = ("", "")
+        mock_process.stdout.read1.return_value = b""
+        mock_process.communicate.return_value = (b"", b"")
         mock_process.returncode = 0
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -163,18 +164,18 @@ class TestExecuteAgent:
     def test_aborts_when_stdout_exceeds_memory_cap(self):
         """A flooding sub-agent must be killed before exhausting broker memory.
 
-        Patches _MAX_STDOUT_CHARS low and feeds non-terminal lines until the
+        Patches _MAX_STDOUT_BYTES low and feeds non-terminal lines until the
         cap trips; verifies kill is called and an explicit error is returned.
         """
         mock_process = MagicMock()
         # ~200 chars per line; cap will be patched below; aim for >cap quickly.
-        flood = ['{"type": "noise", "data": "' + ("x" * 180) + '"}\n'] * 1000 + [""]
-        mock_process.stdout.readline.side_effect = flood
-        mock_process.communicate.return_value = ("", "")
+        flood = [b'{"type": "noise", "data": "' + (b"x" * 180) + b'"}\n'] * 1000 + [b""]
+        mock_process.stdout.read1.side_effect = flood
+        mock_process.communicate.return_value = (b"", b"")
         mock_process.returncode = -9
 
         with patch("subprocess.Popen", return_value=mock_process):
-            with patch("_executor._MAX_STDOUT_CHARS", 1024):  # 1 K codepoints
+            with patch("_executor._MAX_STDOUT_BYTES", 1024):
                 result = execute_agent(
                     AgentInvocation(cli="codex", prompt="x", cwd="/tmp"),
                     timeout_ms=10000,
@@ -186,19 +187,20 @@ class TestExecuteAgent:
 
     def test_stdout_cap_does_not_override_completed_result(self):
         mock_process = MagicMock()
-        flood = ['{"type": "noise", "data": "' + ("x" * 180) + '"}\n'] * 20
-        mock_process.stdout.readline.side_effect = [
-            '{"type": "thread.started"}\n',
-            '{"type": "item.completed", "item": {"type": "agent_message", "text": "DONE"}}\n',
-            '{"type": "turn.completed"}\n',
+        flood = [b'{"type": "noise", "data": "' + (b"x" * 180) + b'"}\n'] * 20
+        mock_process.stdout.read1.side_effect = [
+            b'{"type": "thread.started"}\n',
+            b'{"type": "item.completed", "item": {"type": "agent_message", "text": "DONE"}}\n',
+            b'{"type": "turn.completed"}\n',
             *flood,
-            "",
+            b"",
         ]
-        mock_process.communicate.return_value = ("", "")
+        mock_process.communicate.return_value = (b"", b"")
+        mock_process.wait.side_effect = subprocess.TimeoutExpired("codex", 1)
         mock_process.returncode = 1
 
         with patch("subprocess.Popen", return_value=mock_process):
-            with patch("_executor._MAX_STDOUT_CHARS", 1024):
+            with patch("_executor._MAX_STDOUT_BYTES", 1024):
                 result = execute_agent(
                     AgentInvocation(cli="codex", prompt="x", cwd="/tmp"),
                     timeout_ms=10000,
@@ -208,6 +210,28 @@ class TestExecuteAgent:
         assert mock_process.terminate.called
         assert not mock_process.kill.called
 
+    def test_stdout_is_not_retained_once_result_is_parsed(self):
+        mock_process = MagicMock()
+        mock_process.stdout.read1.side_effect = [
+            b'{"type": "thread.started"}\n',
+            b'{"type": "turn.completed"}\n',
+            b"shutdown noise\n" * 50,
+            b"",
+        ]
+        mock_process.communicate.return_value = (b"", b"")
+        mock_process.returncode = 0
+
+        with patch("subprocess.Popen", return_value=mock_process):
+            with patch(
+                "_executor.build_final_response", wraps=build_final_response
+            ) as final_response:
+                result = execute_agent(
+                    AgentInvocation(cli="codex", prompt="x", cwd="/tmp"),
+                    timeout_ms=5000,
+                )
+        assert result["status"] == "success"
+        assert final_response.call_args[0][3] == ""
+
     def test_timeout_when_cli_blocks_without_output(self):
         """A CLI that produces no output and never exits must be killed by the deadline.
 
@@ -219,11 +243,11 @@ class TestExecuteAgent:
         mock_process = MagicMock()
         kill_event = threading.Event()
 
-        def blocking_readline():
+        def blocking_read(_size):
             kill_event.wait(timeout=5)
-            return ""
+            return b""
 
-        mock_process.stdout.readline.side_effect = blocking_readline
+        mock_process.stdout.read1.side_effect = blocking_read
 
         def stop_process():
             kill_event.set()
@@ -231,7 +255,7 @@ class TestExecuteAgent:
 
         mock_process.kill.side_effect = stop_process
         mock_process.terminate.side_effect = stop_process
-        mock_process.communicate.return_value = ("", "")
+        mock_process.communicate.return_value = (b"", b"")
         mock_process.returncode = None
 
         with patch("subprocess.Popen", return_value=mock_process):
@@ -247,17 +271,11 @@ class TestExecuteAgent:
         assert result["exit_code"] == 124
         assert "timed out after 300 ms" in result["error"]
 
-    def test_popen_uses_explicit_utf8_encoding(self):
-        """Subprocess output must be decoded as UTF-8 on every platform.
-
-        Without an explicit encoding, text mode decodes using the locale
-        codepage (e.g. cp932 on Japanese Windows), garbling the UTF-8 NDJSON
-        the CLIs emit. Pin encoding and use a lenient error policy so malformed
-        bytes degrade gracefully instead of raising.
-        """
+    def test_popen_reads_stdout_as_binary_chunks(self):
+        """Stdout is read as raw bytes in large chunks, not line-buffered text."""
         mock_process = MagicMock()
-        mock_process.stdout.readline.return_value = ""
-        mock_process.communicate.return_value = ("", "")
+        mock_process.stdout.read1.return_value = b""
+        mock_process.communicate.return_value = (b"", b"")
         mock_process.returncode = 0
 
         with patch("subprocess.Popen", return_value=mock_process) as mock_popen:
@@ -266,8 +284,82 @@ class TestExecuteAgent:
                 timeout_ms=5000,
             )
         popen_kwargs = mock_popen.call_args[1]
-        assert popen_kwargs["encoding"] == "utf-8"
-        assert popen_kwargs["errors"] == "replace"
+        assert not popen_kwargs.get("text")
+        assert popen_kwargs["bufsize"] == _READ_CHUNK_BYTES
+        mock_process.stdout.read1.assert_called_with(_READ_CHUNK_BYTES)
+
+    def test_lines_split_across_chunks_are_decoded_as_utf8(self):
+        """Subprocess output must be decoded as UTF-8 on every platform.
+
+        Chunk boundaries fall anywhere, including inside a multi-byte
+        character; lines are reassembled before decoding. The locale codepage
+        (e.g. cp932 on Japanese Windows) is never consulted, and malformed
+        bytes degrade to U+FFFD instead of raising.
+        """
+        mock_process = MagicMock()
+        mock_process.stdout.read1.side_effect = [
+            b'{"type": "res',
+            b'ult", "result": "caf\xc3',
+            b'\xa9 \xff"}\n',
+            b"",
+        ]
+        mock_process.communicate.return_value = (b"", b"")
+        mock_process.returncode = 0
+
+        with patch("subprocess.Popen", return_value=mock_process):
+            result = execute_agent(
+                AgentInvocation(cli="claude", prompt="x", cwd="/tmp"),
+                timeout_ms=5000,
+            )
+        assert result["status"] == "success"
+        assert result["result"] == "caf\u00e9 \ufffd"
+
+    def test_unparsed_stdout_is_returned_decoded_on_error(self):
+        mock_process = MagicMock()
+        mock_process.stdout.read1.side_effect = [b"fatal: caf\xc3\xa9 \xff\n", b"bye\n", b""]
+        mock_process.communicate.return_value = (b"", b"boom \xff")
+        mock_process.returncode = 2
+
+        with patch("subprocess.Popen", return_value=mock_process):
+            result = execute_agent(
+                AgentInvocation(cli="claude", prompt="x", cwd="/tmp"),
+                timeout_ms=5000,
+            )
+        assert result["status"] == "error"
+        assert result["result"] == "fatal: caf\u00e9 \ufffd\nbye\n"
+        assert result["error"] == "CLI exited with code 2: boom \ufffd"
+
+    def test_line_spanning_many_chunks_is_reassembled(self):
+        payload = b"x" * (3 * 65536)
+        mock_process = MagicMock()
+        mock_process.stdout.read1.side_effect = [
+            b'{"type": "noise"}\n{"type": "result", "result": "',
+            *(payload[i : i + 65536] for i in range(0, len(payload), 65536)),
+            b'"}\n{"type": "noise"}\n',
+            b"",
+        ]
+        mock_process.communicate.return_value = (b"", b"")
+        mock_process.returncode = 0
+
+        with patch("subprocess.Popen", return_value=mock_process):
+            result = execute_agent(
+                AgentInvocation(cli="claude", prompt="x", cwd="/tmp"),
+                timeout_ms=5000,
+            )
+        assert result["result"] == payload.decode()
+
+    def test_unterminated_final_line_is_not_dropped(self):
+        mock_process = MagicMock()
+        mock_process.stdout.read1.side_effect = [b'{"type": "result", "result": "tail"}', b""]
+        mock_process.communicate.return_value = (b"", b"")
+        mock_process.returncode = 0
+
+        with patch("subprocess.Popen", return_value=mock_process):
+            result = execute_agent(
+                AgentInvocation(cli="claude", prompt="x", cwd="/tmp"),
+                timeout_ms=5000,
+            )
+        assert result["result"] == "tail"
 
     def test_windows_terminate_exit_code_still_reports_success(self):
         """End-to-end Windows simulation: a complete result then exit code 1.
@@ -277,13 +369,14 @@ class TestExecuteAgent:
         hand this must surface as success, matching POSIX behaviour.
         """
         mock_process = MagicMock()
-        mock_process.stdout.readline.side_effect = [
-            '{"type": "thread.started"}\n',
-            '{"type": "item.completed", "item": {"type": "agent_message", "text": "DONE"}}\n',
-            '{"type": "turn.completed"}\n',
-            "",
+        mock_process.stdout.read1.side_effect = [
+            b'{"type": "thread.started"}\n',
+            b'{"type": "item.completed", "item": {"type": "agent_message", "text": "DONE"}}\n',
+            b'{"type": "turn.completed"}\n',
+            b"",
         ]
-        mock_process.communicate.return_value = ("", "")
+        mock_process.communicate.return_value = (b"", b"")
+        mock_process.wait.side_effect = subprocess.TimeoutExpired("codex", 1)
         mock_process.returncode = 1  # Windows TerminateProcess exit code
 
         with patch("subprocess.Popen", return_value=mock_process):
@@ -291,13 +384,34 @@ class TestExecuteAgent:
                 AgentInvocation(cli="codex", prompt="x", cwd="/tmp"),
                 timeout_ms=5000,
             )
+        assert mock_process.terminate.called
         assert result["status"] == "success"
         assert result["result"] == "DONE"
 
+    def test_cli_exiting_after_result_is_not_terminated(self):
+        """A CLI that exits on its own after its final event is left to finish."""
+        mock_process = MagicMock()
+        mock_process.stdout.read1.side_effect = [
+            b'{"type": "result", "result": "DONE"}\n',
+            b"",
+        ]
+        mock_process.communicate.return_value = (b"", b"")
+        mock_process.wait.return_value = 0
+        mock_process.returncode = 0
+
+        with patch("subprocess.Popen", return_value=mock_process):
+            result = execute_agent(
+                AgentInvocation(cli="claude", prompt="x", cwd="/tmp"),
+                timeout_ms=5000,
+            )
+        assert result["status"] == "success"
+        assert mock_process.wait.called
+        assert not mock_process.terminate.called
+
     def test_gemini_passes_env_with_agent_file(self):
         mock_process = MagicMock()
-        mock_process.stdout.readline.return_value = ""
-        mock_process.communicate.return_value = ("", "")
+        mock_process.stdout.read1.return_value = b""
+        mock_process.communicate.return_value = (b"", b"")
         mock_process.returncode = 0
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -320,16 +434,16 @@ class TestExecuteAgent:
 
     def test_grok_pretty_json_output_is_parsed_after_exit(self):
         mock_process = MagicMock()
-        mock_process.stdout.readline.side_effect = [
-            "{\n",
-            '  "text": "{\\"findings\\":[]}",\n',
-            '  "stopReason": "EndTurn",\n',
-            '  "sessionId": "s",\n',
-            '  "requestId": "r"\n',
-            "}\n",
-            "",
+        mock_process.stdout.read1.side_effect = [
+            b"{\n",
+            b'  "text": "{\\"findings\\":[]}",\n',
+            b'  "stopReason": "EndTurn",\n',
+            b'  "sessionId": "s",\n',
+            b'  "requestId": "r"\n',
+            b"}\n",
+            b"",
         ]
-        mock_process.communicate.return_value = ("", "")
+        mock_process.communicate.return_value = (b"", b"")
         mock_process.returncode = 0
 
         with patch("subprocess.Popen", return_value=mock_process):
@@ -342,11 +456,11 @@ class TestExecuteAgent:
 
     def test_grok_compact_json_output_is_normalized(self):
         mock_process = MagicMock()
-        mock_process.stdout.readline.side_effect = [
-            '{"text": "{\\"findings\\":[]}", "stopReason": "EndTurn"}\n',
-            "",
+        mock_process.stdout.read1.side_effect = [
+            b'{"text": "{\\"findings\\":[]}", "stopReason": "EndTurn"}\n',
+            b"",
         ]
-        mock_process.communicate.return_value = ("", "")
+        mock_process.communicate.return_value = (b"", b"")
         mock_process.returncode = 0
 
         with patch("subprocess.Popen", return_value=mock_process):
@@ -359,11 +473,11 @@ class TestExecuteAgent:
 
     def test_grok_compact_cancelled_output_stays_partial(self):
         mock_process = MagicMock()
-        mock_process.stdout.readline.side_effect = [
-            '{"text": "progress only", "stopReason": "Cancelled"}\n',
-            "",
+        mock_process.stdout.read1.side_effect = [
+            b'{"text": "progress only", "stopReason": "Cancelled"}\n',
+            b"",
         ]
-        mock_process.communicate.return_value = ("", "")
+        mock_process.communicate.return_value = (b"", b"")
         mock_process.returncode = 1
 
         with patch("subprocess.Popen", return_value=mock_process):
@@ -376,16 +490,16 @@ class TestExecuteAgent:
 
     def test_opencode_ndjson_output_is_parsed(self):
         mock_process = MagicMock()
-        mock_process.stdout.readline.side_effect = [
-            '{"type":"step_start","part":{}}\n',
-            '{"type":"tool_use","part":{"tool":"read"}}\n',
-            '{"type":"step_finish","part":{"reason":"tool-calls"}}\n',
-            '{"type":"step_start","part":{}}\n',
-            '{"type":"text","part":{"text":"DONE"}}\n',
-            '{"type":"step_finish","part":{"reason":"stop"}}\n',
-            "",
+        mock_process.stdout.read1.side_effect = [
+            b'{"type":"step_start","part":{}}\n',
+            b'{"type":"tool_use","part":{"tool":"read"}}\n',
+            b'{"type":"step_finish","part":{"reason":"tool-calls"}}\n',
+            b'{"type":"step_start","part":{}}\n',
+            b'{"type":"text","part":{"text":"DONE"}}\n',
+            b'{"type":"step_finish","part":{"reason":"stop"}}\n',
+            b"",
         ]
-        mock_process.communicate.return_value = ("", "")
+        mock_process.communicate.return_value = (b"", b"")
         mock_process.returncode = 0
 
         with patch("subprocess.Popen", return_value=mock_process):
@@ -407,12 +521,12 @@ class TestOpencodeDataDirIsolation:
 
     def _mock_process(self):
         m = MagicMock()
-        m.stdout.readline.side_effect = [
-            '{"type":"text","part":{"text":"DONE"}}\n',
-            '{"type":"step_finish","part":{"reason":"stop"}}\n',
-            "",
+        m.stdout.read1.side_effect = [
+            b'{"type":"text","part":{"text":"DONE"}}\n',
+            b'{"type":"step_finish","part":{"reason":"stop"}}\n',
+            b"",
         ]
-        m.communicate.return_value = ("", "")
+        m.communicate.return_value = (b"", b"")
         m.returncode = 0
         return m
 
@@ -457,7 +571,7 @@ class TestOpencodeDataDirIsolation:
     def test_temp_dir_is_removed_after_io_error_once_process_is_reaped(self):
         captured = {}
         process = MagicMock()
-        process.stdout.readline.return_value = ""
+        process.stdout.read1.return_value = b""
         process.returncode = -9
 
         process.communicate.side_effect = OSError("pipe failure")
@@ -532,12 +646,12 @@ class TestOpencodeDataDirIsolation:
         def popen_factory(cmd, **kwargs):
             captured["env"] = kwargs["env"]
             m = MagicMock()
-            m.stdout.readline.side_effect = [
-                '{"type": "item.completed", "item": {"type": "agent_message", "text": "ok"}}\n',
-                '{"type": "turn.completed"}\n',
-                "",
+            m.stdout.read1.side_effect = [
+                b'{"type": "item.completed", "item": {"type": "agent_message", "text": "ok"}}\n',
+                b'{"type": "turn.completed"}\n',
+                b"",
             ]
-            m.communicate.return_value = ("", "")
+            m.communicate.return_value = (b"", b"")
             m.returncode = 0
             return m
 
@@ -576,13 +690,13 @@ class TestMainEndToEnd:
                 assert args[model_idx + 1] == "gpt-5.4-mini"
                 assert ("-c", 'model_reasoning_effort="high"') in zip(args, args[1:])
                 m = MagicMock()
-                m.stdout.readline.side_effect = [
-                    '{"type": "thread.started"}\n',
-                    '{"type": "item.completed", "item": {"type": "agent_message", "text": "PONG"}}\n',
-                    '{"type": "turn.completed"}\n',
-                    "",
+                m.stdout.read1.side_effect = [
+                    b'{"type": "thread.started"}\n',
+                    b'{"type": "item.completed", "item": {"type": "agent_message", "text": "PONG"}}\n',
+                    b'{"type": "turn.completed"}\n',
+                    b"",
                 ]
-                m.communicate.return_value = ("", "")
+                m.communicate.return_value = (b"", b"")
                 m.returncode = 0
                 return m
 
@@ -696,3 +810,21 @@ class TestMainEndToEnd:
             payload = json.loads(buf.getvalue().strip())
             assert exc_info.value.code == 0
             assert payload["agents"] == [{"name": "a", "description": "one."}]
+
+    def test_main_list_output_matches_single_json_document(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            agents_dir = Path(tmpdir) / ".agents"
+            agents_dir.mkdir()
+            for name in ("b", "a", "c"):
+                (agents_dir / f"{name}.md").write_text(f"# {name}\n\nAgent {name} \u00e9.")
+            argv = ["run_subagent.py", "--list", "--cwd", tmpdir]
+            with patch.object(sys, "argv", argv):
+                buf = StringIO()
+                with patch("sys.stdout", buf):
+                    with pytest.raises(SystemExit):
+                        main()
+            expected = {
+                "agents": [{"name": n, "description": f"Agent {n} \u00e9."} for n in "abc"],
+                "agents_dir": str(agents_dir),
+            }
+            assert buf.getvalue() == json.dumps(expected, ensure_ascii=False) + "\n"
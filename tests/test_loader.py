@@ -34,6 +34,25 @@ Body content here.
         assert "# Agent Name" in body
         assert "---" not in body
 
+    def test_comments_quotes_and_crlf(self):
+        content = (
+            "---\r\n"
+            "# run-agent: gemini\r\n"
+            "  run-agent : 'claude'\r\n"
+            'model: "x:y"\r\n'
+            "not a field\r\n"
+            "---\r\n"
+            "Body."
+        )
+        frontmatter, body = parse_frontmatter(content)
+        assert frontmatter == {"run-agent": "claude", "model": "x:y"}
+        assert body == "Body."
+
+    def test_value_may_contain_colons(self):
+        content = "---\nrun-agent: claude\ndescription: note: colons\n---\nBody."
+        frontmatter, _ = parse_frontmatter(content)
+        assert frontmatter == {"run-agent": "claude", "description": "note: colons"}
+
     def test_without_frontmatter(self):
         content = """# Agent Name
 
@@ -154,6 +173,51 @@ Do something.
             assert model is None
             assert effort is None
 
+    def test_rewritten_file_is_read_again(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            agent_file = Path(tmpdir) / "agent.md"
+            agent_file.write_text("---\npermission: safe-edit\n---\n# Agent\n")
+            load_agent(tmpdir, "agent")
+            # Same size, possibly the same mtime tick.
+            agent_file.write_text("---\npermission: read-only\n---\n# Agent\n")
+            _, _, _, _, permission, _, _ = load_agent(tmpdir, "agent")
+            assert permission == "read-only"
+
+    def test_loads_txt_when_markdown_is_missing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "plain.txt").write_text("# Plain\n\nText agent.")
+            _, _, desc, file_path, _, _, _ = load_agent(tmpdir, "plain")
+            assert desc == "Text agent."
+            assert file_path.endswith("plain.txt")
+
+    def test_rejects_symlink_escaping_agents_dir(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            agents_dir = Path(tmpdir) / "agents"
+            agents_dir.mkdir()
+            outside = Path(tmpdir) / "outside.md"
+            outside.write_text("# Outside\n\nNot an agent.")
+            try:
+                (agents_dir / "escape.md").symlink_to(outside)
+            except (OSError, NotImplementedError):
+                pytest.skip("symlinks unavailable")
+            with pytest.raises(ValueError, match="outside the agents directory"):
+                load_agent(str(agents_dir), "escape")
+
+    def test_rejects_symlink_into_sibling_with_shared_prefix(self):
+        # A string prefix check would accept agents-evil/ as inside agents/.
+        with tempfile.TemporaryDirectory() as tmpdir:
+            agents_dir = Path(tmpdir) / "agents"
+            agents_dir.mkdir()
+            sibling = Path(tmpdir) / "agents-evil"
+            sibling.mkdir()
+            (sibling / "payload.md").write_text("# Payload\n\nNot an agent.")
+            try:
+                (agents_dir / "escape.md").symlink_to(sibling / "payload.md")
+            except (OSError, NotImplementedError):
+                pytest.skip("symlinks unavailable")
+            with pytest.raises(ValueError, match="outside the agents directory"):
+                load_agent(str(agents_dir), "escape")
+
     def test_agent_not_found(self):
         with tempfile.TemporaryDirectory() as tmpdir, pytest.raises(FileNotFoundError):
             load_agent(tmpdir, "nonexistent")
@@ -170,6 +234,32 @@ class TestListAgents:
             assert "agent-a" in names
             assert "agent-b" in names
 
+    def test_list_prefers_markdown_over_text(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "dup.txt").write_text("# Dup\n\nFrom text.")
+            (Path(tmpdir) / "dup.md").write_text("# Dup\n\nFrom markdown.")
+            (Path(tmpdir) / "plain.txt").write_text("# Plain\n\nText only.")
+            agents = list_agents(tmpdir)
+            assert agents == [
+                {"name": "dup", "description": "From markdown."},
+                {"name": "plain", "description": "Text only."},
+            ]
+
+    def test_list_skips_directories_and_other_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "nested.md").mkdir()
+            (Path(tmpdir) / "notes.json").write_text("{}")
+            (Path(tmpdir) / "real.md").write_text("# Real\n\nAgent.")
+            assert [a["name"] for a in list_agents(tmpdir)] == ["real"]
+
+    def test_list_many_agents_reads_every_description(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(12):
+                (Path(tmpdir) / f"agent-{i:02d}.md").write_text(f"# Agent\n\nNumber {i}.")
+            agents = list_agents(tmpdir)
+            assert [a["name"] for a in agents] == [f"agent-{i:02d}" for i in range(12)]
+            assert [a["description"] for a in agents] == [f"Number {i}." for i in range(12)]
+
     def test_list_empty_directory(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             agents = list_agents(tmpdir)
@@ -25,13 +25,15 @@ class TestResolveCli:
     def test_default_fallback(self):
         # No frontmatter and no caller env -> default
         with patch.dict("os.environ", {}, clear=True):
-            with patch("os.path.exists", return_value=False):
-                assert resolve_cli(None) == "codex"
+            with patch("os.readlink", side_effect=OSError):
+                with patch("os.path.exists", return_value=False):
+                    assert resolve_cli(None) == "codex"
 
     def test_invalid_frontmatter_uses_default(self):
         with patch.dict("os.environ", {}, clear=True):
-            with patch("os.path.exists", return_value=False):
-                assert resolve_cli("invalid-cli") == "codex"
+            with patch("os.readlink", side_effect=OSError):
+                with patch("os.path.exists", return_value=False):
+                    assert resolve_cli("invalid-cli") == "codex"
 
 
 class TestDetectCallerCli:
@@ -47,17 +49,33 @@ class TestDetectCallerCli:
         with patch.dict("os.environ", {"GROK_CLI": "1"}, clear=True):
             assert detect_caller_cli() == "grok"
 
+    def test_detects_native_cli_from_parent_executable(self):
+        with patch.dict("os.environ", {}, clear=True):
+            with patch("os.readlink", return_value="/home/u/.local/bin/claude") as readlink:
+                with patch("builtins.open") as open_:
+                    assert detect_caller_cli() == "claude"
+        assert readlink.call_args[0][0].endswith("/exe")
+        assert not open_.called
+
     def test_detects_opencode_from_parent_process(self):
         with patch.dict("os.environ", {}, clear=True):
-            with patch("os.path.exists", return_value=True):
-                with patch(
-                    "builtins.open",
-                    mock_open(read_data="/opt/homebrew/bin/opencode\0run"),
-                ):
-                    assert detect_caller_cli() == "opencode"
+            with patch("os.readlink", return_value="/usr/bin/node"):
+                with patch("os.path.exists", return_value=True):
+                    with patch(
+                        "builtins.open",
+                        mock_open(read_data="/opt/homebrew/bin/opencode\0run"),
+                    ):
+                        assert detect_caller_cli() == "opencode"
+
+    def test_result_is_cached_for_the_process(self):
+        with patch.dict("os.environ", {"CODEX_CLI": "1"}, clear=True):
+            assert detect_caller_cli() == "codex"
+        with patch.dict("os.environ", {"CLAUDE_CODE": "1"}, clear=True):
+            assert detect_caller_cli() == "codex"
 
     def test_returns_none_when_no_indicator(self):
         """No env indicator and /proc absent — must return None deterministically."""
         with patch.dict("os.environ", {}, clear=True):
-            with patch("os.path.exists", return_value=False):
-                assert detect_caller_cli() is None
+            with patch("os.readlink", side_effect=OSError):
+                with patch("os.path.exists", return_value=False):
+                    assert detect_caller_cli() is None
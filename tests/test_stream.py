@@ -2,50 +2,53 @@
 
 from __future__ import annotations
 
+import json
+from unittest.mock import MagicMock, patch
+
 from _stream import StreamProcessor, _extract_trailing_json_object
 
 
 class TestStreamProcessor:
     def test_claude_result(self):
         processor = StreamProcessor()
-        assert processor.process_line('{"type": "result", "result": "hello"}')
+        assert processor.process_line(b'{"type": "result", "result": "hello"}')
         result = processor.get_result()
         assert result["result"] == "hello"
 
     def test_gemini_stream(self):
         processor = StreamProcessor()
-        assert not processor.process_line('{"type": "init"}')
+        assert not processor.process_line(b'{"type": "init"}')
         assert not processor.process_line(
-            '{"type": "message", "role": "assistant", "content": "part1"}'
+            b'{"type": "message", "role": "assistant", "content": "part1"}'
         )
         assert not processor.process_line(
-            '{"type": "message", "role": "assistant", "content": "part2"}'
+            b'{"type": "message", "role": "assistant", "content": "part2"}'
         )
-        assert processor.process_line('{"type": "result", "status": "success"}')
+        assert processor.process_line(b'{"type": "result", "status": "success"}')
         result = processor.get_result()
         assert result["result"] == "part1part2"
 
     def test_codex_stream(self):
         processor = StreamProcessor()
-        assert not processor.process_line('{"type": "thread.started"}')
+        assert not processor.process_line(b'{"type": "thread.started"}')
         assert not processor.process_line(
-            '{"type": "item.completed", "item": {"type": "agent_message", "text": "msg1"}}'
+            b'{"type": "item.completed", "item": {"type": "agent_message", "text": "msg1"}}'
         )
         assert not processor.process_line(
-            '{"type": "item.completed", "item": {"type": "agent_message", "text": "msg2"}}'
+            b'{"type": "item.completed", "item": {"type": "agent_message", "text": "msg2"}}'
         )
-        assert processor.process_line('{"type": "turn.completed"}')
+        assert processor.process_line(b'{"type": "turn.completed"}')
         result = processor.get_result()
         assert result["result"] == "msg1\nmsg2"
 
     def test_opencode_stream_collects_text_until_stop(self):
         processor = StreamProcessor()
-        assert not processor.process_line('{"type":"step_start","part":{}}')
-        assert not processor.process_line('{"type":"text","part":{"text":"part1"}}')
-        assert not processor.process_line('{"type":"step_finish","part":{"reason":"tool-calls"}}')
-        assert not processor.process_line('{"type":"step_start","part":{}}')
-        assert not processor.process_line('{"type":"text","part":{"text":"part2"}}')
-        assert processor.process_line('{"type":"step_finish","part":{"reason":"stop"}}')
+        assert not processor.process_line(b'{"type":"step_start","part":{}}')
+        assert not processor.process_line(b'{"type":"text","part":{"text":"part1"}}')
+        assert not processor.process_line(b'{"type":"step_finish","part":{"reason":"tool-calls"}}')
+        assert not processor.process_line(b'{"type":"step_start","part":{}}')
+        assert not processor.process_line(b'{"type":"text","part":{"text":"part2"}}')
+        assert processor.process_line(b'{"type":"step_finish","part":{"reason":"stop"}}')
         result = processor.get_result()
         assert result["result"] == "part1part2"
         assert result["status"] == "success"
@@ -53,8 +56,8 @@ class TestStreamProcessor:
 
     def test_opencode_non_stop_finish_is_partial(self):
         processor = StreamProcessor()
-        assert not processor.process_line('{"type":"text","part":{"text":"truncated"}}')
-        assert processor.process_line('{"type":"step_finish","part":{"reason":"length"}}')
+        assert not processor.process_line(b'{"type":"text","part":{"text":"truncated"}}')
+        assert processor.process_line(b'{"type":"step_finish","part":{"reason":"length"}}')
         result = processor.get_result()
         assert result["result"] == "truncated"
         assert result["status"] == "partial"
@@ -75,7 +78,7 @@ class TestStreamProcessor:
 
     def test_grok_compact_json_line_output(self):
         processor = StreamProcessor()
-        assert processor.process_line('{"text": "{\\"findings\\":[]}", "stopReason": "EndTurn"}')
+        assert processor.process_line(b'{"text": "{\\"findings\\":[]}", "stopReason": "EndTurn"}')
         result = processor.get_result()
         assert result["type"] == "result"
         assert result["result"] == '{"findings":[]}'
@@ -83,14 +86,14 @@ class TestStreamProcessor:
 
     def test_grok_compact_json_line_cancelled_is_partial(self):
         processor = StreamProcessor()
-        assert processor.process_line('{"text": "progress only", "stopReason": "Cancelled"}')
+        assert processor.process_line(b'{"text": "progress only", "stopReason": "Cancelled"}')
         result = processor.get_result()
         assert result["result"] == "progress only"
         assert result["status"] == "partial"
 
     def test_typeless_json_without_text_uses_fallback(self):
         processor = StreamProcessor()
-        assert processor.process_line('{"message": "raw"}')
+        assert processor.process_line(b'{"message": "raw"}')
         assert processor.get_result() == {"message": "raw"}
 
     def test_grok_complete_json_cancelled_is_partial(self):
@@ -113,3 +116,75 @@ class TestStreamProcessor:
     def test_extract_trailing_json_object_rejects_extra_suffix(self):
         text = 'prefix {"findings":[]} trailing'
         assert _extract_trailing_json_object(text) == text
+
+    def test_non_object_lines_are_ignored(self):
+        processor = StreamProcessor()
+        assert not processor.process_line(b"")
+        assert not processor.process_line(b"Loading configuration...")
+        assert not processor.process_line(b"[1, 2]")
+        assert not processor.process_line(b"42")
+        assert processor.get_result() is None
+
+    def test_lines_after_result_are_ignored(self):
+        processor = StreamProcessor()
+        assert processor.process_line(b'{"type": "result", "result": "first"}')
+        assert not processor.process_line(b'{"type": "result", "result": "second"}')
+        assert processor.get_result()["result"] == "first"
+
+    def test_cli_specific_events_are_ignored_before_discriminator(self):
+        processor = StreamProcessor()
+        assert not processor.process_line(
+            b'{"type": "message", "role": "assistant", "content": "stray"}'
+        )
+        assert not processor.process_line(b'{"type": "turn.completed"}')
+        assert processor.process_line(b'{"type": "result", "result": "claude"}')
+        assert processor.get_result() == {"type": "result", "result": "claude"}
+
+    def test_invalid_utf8_is_replaced_not_dropped(self):
+        processor = StreamProcessor()
+        assert processor.process_line(b'{"type": "result", "result": "ok \xff"}')
+        assert processor.get_result()["result"] == "ok \ufffd"
+
+    def test_short_stream_stays_on_stdlib_json(self):
+        processor = StreamProcessor()
+        assert not processor.process_line(b'{"type": "thread.started"}')
+        assert processor._loads is json.loads
+
+    def test_large_stream_switches_to_fast_loads(self):
+        fast_loads = MagicMock(wraps=json.loads)
+        with patch("_stream._FAST_LOADS_AFTER_BYTES", 64), patch("_stream._fast_loads", fast_loads):
+            processor = StreamProcessor()
+            assert not processor.process_line(b'{"type": "thread.started"}')
+            assert not processor.process_line(
+                b'{"type": "item.completed", "item": {"type": "agent_message", "text": "msg"}}'
+            )
+            assert processor.process_line(b'{"type": "turn.completed"}')
+        assert fast_loads.call_count == 2
+        assert processor.get_result()["result"] == "msg"
+
+    def test_classified_stream_skips_generic_fallbacks(self):
+        processor = StreamProcessor()
+        assert not processor.process_line(b'{"type": "thread.started"}')
+        assert not processor.process_line(b'{"text": "not grok", "stopReason": "EndTurn"}')
+        assert not processor.process_line(b'{"message": "typeless"}')
+        assert processor.get_result() is None
+        assert processor.process_line(b'{"type": "turn.completed"}')
+
+    def test_classified_stream_ignores_opencode_types_without_part(self):
+        processor = StreamProcessor()
+        assert not processor.process_line(b'{"type": "init"}')
+        assert not processor.process_line(
+            b'{"type": "tool_use", "text": "not grok", "stopReason": "EndTurn"}'
+        )
+        assert not processor.process_line(b'{"type": "text", "part": "not a dict"}')
+        assert processor.get_result() is None
+        assert processor.process_line(b'{"type": "result", "status": "success"}')
+        assert processor.get_result()["result"] == ""
+
+    def test_codex_item_without_payload_is_skipped(self):
+        processor = StreamProcessor()
+        assert not processor.process_line(b'{"type": "thread.started"}')
+        assert not processor.process_line(b'{"type": "item.completed"}')
+        assert not processor.process_line(b'{"type": "item.completed", "item": null}')
+        assert processor.process_line(b'{"type": "turn.completed"}')
+        assert processor.get_result()["result"] == ""